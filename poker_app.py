@@ -1,7 +1,29 @@
 import streamlit as st
-import random
+import functools
 import itertools
-from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; the kernels still run as plain Python
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# The lookup tables live in their own module so Streamlit's per-rerun
+# re-execution of this script doesn't rebuild them; see poker_tables.py.
+from poker_tables import (
+    CARD_INT, CARD_INT_TO_STR, CONNECTED_MASK, FLUSH_LOOKUP, FLUSH_LUT,
+    FULL_DECK, HAND_CATEGORY, PARSE_CARD, PRIMES, RANK7_KEYS, RANK7_LOOKUP,
+    RANK7_VALS, STRAIGHT_LUT, STRAIGHT_OF_MASK, SUIT_INDEX, TOP5_LUT,
+    TOP5_OF_MASK, UNSUITED_LOOKUP)
 
 
 # ============================================================================
@@ -18,87 +40,91 @@ class PokerHand:
     @staticmethod
     def parse_card(card_str):
         """Parse card string like '2H', 'AH' into rank and suit"""
+        parsed = PARSE_CARD.get(card_str.upper())
+        if parsed is not None:
+            return parsed
+        # Not a valid card: fall through to the old checks for the message.
         if len(card_str) < 2:
             raise ValueError(f"Invalid card format: {card_str}")
-        rank = card_str[:-1].upper()
         suit = card_str[-1].upper()
         if suit not in 'HDCS':
             raise ValueError(f"Invalid suit: {suit}")
-        if rank not in PokerHand.RANKS:
-            raise ValueError(f"Invalid rank: {rank}")
-        return rank, suit
+        raise ValueError(f"Invalid rank: {card_str[:-1].upper()}")
 
     @staticmethod
     def evaluate_hand(cards):
-        """Evaluate a 5-card hand. Returns tuple for comparison."""
+        """Evaluate a 5-card hand of card ints. Returns an int score (1 = best)."""
         if len(cards) != 5:
             raise ValueError(f"Expected 5 cards, got {len(cards)}")
 
-        ranks = [PokerHand.RANKS[PokerHand.parse_card(card)[0]] for card in cards]
-        suits = [PokerHand.parse_card(card)[1] for card in cards]
-
-        rank_counts = Counter(ranks)
-        suit_counts = Counter(suits)
-
-        is_flush = len(suit_counts) == 1
-
-        sorted_ranks = sorted(ranks, reverse=True)
-        is_straight = False
-        straight_high = 0
-
-        if sorted_ranks[0] - sorted_ranks[4] == 4:
-            is_straight = True
-            straight_high = sorted_ranks[0]
-        elif sorted_ranks == [14, 5, 4, 3, 2]:
-            is_straight = True
-            straight_high = 5
-
-        counts = sorted(rank_counts.values(), reverse=True)
-        unique_ranks = sorted(set(ranks), reverse=True)
-
-        if is_straight and is_flush:
-            if straight_high == 14 and 13 not in unique_ranks:
-                return (9, straight_high)
-            return (8, straight_high)
-        elif counts == [4, 1]:
-            four_kind = [r for r, c in rank_counts.items() if c == 4][0]
-            return (7, four_kind)
-        elif counts == [3, 2]:
-            three_kind = [r for r, c in rank_counts.items() if c == 3][0]
-            pair = [r for r, c in rank_counts.items() if c == 2][0]
-            return (6, three_kind, pair)
-        elif is_flush:
-            return (5, tuple(sorted_ranks))
-        elif is_straight:
-            return (4, straight_high)
-        elif counts == [3, 1, 1]:
-            three_kind = [r for r, c in rank_counts.items() if c == 3][0]
-            kickers = sorted([r for r, c in rank_counts.items() if c == 1], reverse=True)
-            return (3, three_kind, tuple(kickers))
-        elif counts == [2, 2, 1]:
-            pairs = sorted([r for r, c in rank_counts.items() if c == 2], reverse=True)
-            kicker = [r for r, c in rank_counts.items() if c == 1][0]
-            return (2, tuple(pairs), kicker)
-        elif counts == [2, 1, 1, 1]:
-            pair = [r for r, c in rank_counts.items() if c == 2][0]
-            kickers = sorted([r for r, c in rank_counts.items() if c == 1], reverse=True)
-            return (1, pair, tuple(kickers))
-        else:
-            return (0, tuple(sorted_ranks))
+        c1, c2, c3, c4, c5 = cards
+
+        if c1 & c2 & c3 & c4 & c5 & 0xF000:
+            return FLUSH_LOOKUP[(c1 | c2 | c3 | c4 | c5) >> 16]
+        return UNSUITED_LOOKUP[(c1 & 0xFF) * (c2 & 0xFF) * (c3 & 0xFF) *
+                               (c4 & 0xFF) * (c5 & 0xFF)]
 
     @staticmethod
     def best_five_from_seven(cards):
-        """Find best 5-card hand from 7 cards"""
-        best_hand = None
-        best_score = None
-
+        """Find best 5-card hand from 7 card ints"""
+        # Flush fast path: count the four suits in one pass; at most one
+        # suit can reach 5 cards out of 7, and the flush lookup also covers
+        # straight and royal flushes.
+        suit_count = [0, 0, 0, 0]
+        for c in cards:
+            suit_count[SUIT_INDEX[c & 0xF000]] += 1
+        for s in range(4):
+            if suit_count[s] >= 5:
+                suit_bit = 0x1000 << s
+                suited = [c for c in cards if c & suit_bit]
+                rank_mask = 0
+                for c in suited:
+                    rank_mask |= c >> 16
+                best_mask = (STRAIGHT_OF_MASK[rank_mask]
+                             or TOP5_OF_MASK[rank_mask])
+                hand = tuple(c for c in suited if (c >> 16) & best_mask)
+                return hand, FLUSH_LOOKUP[best_mask]
+
+        rank_count = [0] * 13
+        for c in cards:
+            rank_count[(c >> 8) & 0xF] += 1
+
+        # Four of a kind: quads plus the best kicker, no enumeration needed
+        # (a flush cannot coexist with quads in 7 cards).
+        if 4 in rank_count:
+            quad = rank_count.index(4)
+            kicker = max(i for i in range(13) if rank_count[i] and i != quad)
+            hand = tuple(c for c in cards if (c >> 8) & 0xF == quad)
+            hand += (next(c for c in cards if (c >> 8) & 0xF == kicker),)
+            return hand, UNSUITED_LOOKUP[PRIMES[quad] ** 4 * PRIMES[kicker]]
+
+        # Full house: highest trips plus the highest remaining pair.
+        trips = [i for i in range(13) if rank_count[i] == 3]
+        if trips:
+            three = max(trips)
+            pairs = [i for i in range(13) if rank_count[i] >= 2 and i != three]
+            if pairs:
+                pair = max(pairs)
+                hand = tuple(c for c in cards if (c >> 8) & 0xF == three)
+                hand += tuple(c for c in cards if (c >> 8) & 0xF == pair)[:2]
+                return hand, UNSUITED_LOOKUP[PRIMES[three] ** 3 * PRIMES[pair] ** 2]
+
+        # Remaining shapes: one 7-card table lookup gives the score, then a
+        # short scan finds the combination that realizes it for display.
+        product = 1
+        for c in cards:
+            product *= c & 0xFF
+        best_score = RANK7_LOOKUP[product]
         for combo in itertools.combinations(cards, 5):
-            score = PokerHand.evaluate_hand(combo)
-            if best_score is None or score > best_score:
-                best_score = score
-                best_hand = combo
+            if PokerHand.evaluate_hand(combo) == best_score:
+                return combo, best_score
 
-        return best_hand, best_score
+    @staticmethod
+    def hand_for_score(cards, score):
+        """Return 5 cards out of `cards` realizing an already-known score"""
+        for combo in itertools.combinations(cards, 5):
+            if PokerHand.evaluate_hand(combo) == score:
+                return combo
 
     @staticmethod
     def hand_rank_name(score):
@@ -115,7 +141,236 @@ class PokerHand:
             1: "👉 One Pair",
             0: "🎲 High Card"
         }
-        return names.get(score[0], "Unknown")
+        return names.get(HAND_CATEGORY[score], "Unknown")
+
+
+def card_to_int(card_str):
+    """Validate a card string and return its int code in one dict probe"""
+    card_int = CARD_INT.get(card_str.upper())
+    if card_int is None:
+        PokerHand.parse_card(card_str)  # raises with the specific message
+    return card_int
+
+# One generator shared by the dealer and the vectorized simulator, so
+# nothing touches the global random state. Deliberately unseeded: a fixed
+# seed would deal the same AI hands every game, since Streamlit re-runs
+# this script (and would re-seed) on every interaction. Reproducibility
+# of the estimates comes from the lru_cache/st.cache_data layers instead.
+_NP_RNG = np.random.default_rng()
+
+
+# ============================================================================
+# MONTE CARLO KERNELS (NUMBA)
+# ============================================================================
+
+@njit(cache=True)
+def _evaluate7(ints):
+    """Score a 7-card hand of card ints. Lower is better, as in evaluate_hand."""
+    for s in range(4):
+        suit_bit = 0x1000 << s
+        suited_count = 0
+        rank_mask = 0
+        for i in range(7):
+            c = ints[i]
+            if c & suit_bit:
+                suited_count += 1
+                rank_mask |= c >> 16
+        if suited_count >= 5:
+            straight_mask = STRAIGHT_LUT[rank_mask]
+            if straight_mask:
+                return FLUSH_LUT[straight_mask]
+            return FLUSH_LUT[TOP5_LUT[rank_mask]]
+
+    product = 1
+    for i in range(7):
+        product *= ints[i] & 0xFF
+    return RANK7_VALS[np.searchsorted(RANK7_KEYS, product)]
+
+
+@njit(cache=True, parallel=True)
+def _simulate_showdowns(p1, p2, p3, board, deck, n_sims):
+    """Count wins/ties for 3 players over n_sims random board completions."""
+    n_board = board.shape[0]
+    need = 5 - n_board
+    n_deck = deck.shape[0]
+
+    # Accumulate into scalars: numba privatizes scalar reductions across
+    # the prange threads, whereas indexed writes to a shared array race.
+    w1 = 0
+    w2 = 0
+    w3 = 0
+    ties = 0
+
+    for _ in prange(n_sims):
+        local = deck.copy()
+        for i in range(need):
+            j = i + np.random.randint(0, n_deck - i)
+            tmp = local[i]
+            local[i] = local[j]
+            local[j] = tmp
+
+        hand = np.empty(7, dtype=np.int64)
+        for i in range(n_board):
+            hand[2 + i] = board[i]
+        for i in range(need):
+            hand[2 + n_board + i] = local[i]
+
+        hand[0] = p1[0]
+        hand[1] = p1[1]
+        s1 = _evaluate7(hand)
+        hand[0] = p2[0]
+        hand[1] = p2[1]
+        s2 = _evaluate7(hand)
+        hand[0] = p3[0]
+        hand[1] = p3[1]
+        s3 = _evaluate7(hand)
+
+        best = min(s1, s2, s3)
+        n_best = (s1 == best) + (s2 == best) + (s3 == best)
+        if n_best > 1:
+            ties += 1
+        elif s1 == best:
+            w1 += 1
+        elif s2 == best:
+            w2 += 1
+        else:
+            w3 += 1
+
+    totals = np.empty(4, dtype=np.int64)
+    totals[0] = w1
+    totals[1] = w2
+    totals[2] = w3
+    totals[3] = ties
+    return totals
+
+
+@njit(cache=True, nogil=True)
+def _simulate_strength(player, board, deck, n_sims):
+    """Count sims where the player's hand ties or beats one random opponent.
+
+    nogil=True drops the GIL for the compiled body, which is what lets the
+    per-player calls from display_stage_analysis's thread pool actually run
+    concurrently. Deliberately not parallel=True: this kernel runs a few
+    hundred sims at most and is called from worker threads, and numba's
+    default threading layer does not support concurrent entry into
+    parallel regions."""
+    n_board = board.shape[0]
+    need = 5 - n_board
+    n_deck = deck.shape[0]
+    wins = 0
+
+    for _ in range(n_sims):
+        local = deck.copy()
+        for i in range(2 + need):
+            j = i + np.random.randint(0, n_deck - i)
+            tmp = local[i]
+            local[i] = local[j]
+            local[j] = tmp
+
+        hand = np.empty(7, dtype=np.int64)
+        for i in range(n_board):
+            hand[2 + i] = board[i]
+        for i in range(need):
+            hand[2 + n_board + i] = local[2 + i]
+
+        hand[0] = player[0]
+        hand[1] = player[1]
+        player_score = _evaluate7(hand)
+        hand[0] = local[0]
+        hand[1] = local[1]
+        opp_score = _evaluate7(hand)
+
+        if player_score <= opp_score:
+            wins += 1
+
+    return wins
+
+
+def _int_array(cards):
+    """Wrap a list of card ints as an int64 array for the kernels."""
+    return np.array(cards, dtype=np.int64)
+
+
+# ============================================================================
+# PARTIAL-HAND STATE
+# ============================================================================
+
+# A partial hand is (rank-prime product, per-suit rank masks). It can be
+# extended one street at a time, so each player's state is built up as the
+# board grows instead of being rederived from all 7 cards at the showdown.
+
+def partial_hand_state(cards):
+    """Build the partial-hand state for a list of card ints"""
+    return extend_partial_state((1, (0, 0, 0, 0)), cards)
+
+
+def extend_partial_state(state, new_cards):
+    """Return `state` extended with the given card ints"""
+    product, masks = state
+    masks = list(masks)
+    for c in new_cards:
+        product *= c & 0xFF
+        masks[SUIT_INDEX[c & 0xF000]] |= c >> 16
+    return product, tuple(masks)
+
+
+def evaluate_partial(state):
+    """Score a complete 7-card partial-hand state with a single lookup"""
+    product, masks = state
+    for mask in masks:
+        if mask.bit_count() >= 5:
+            best_mask = STRAIGHT_OF_MASK[mask] or TOP5_OF_MASK[mask]
+            return FLUSH_LOOKUP[best_mask]
+    return RANK7_LOOKUP[product]
+
+
+def _evaluate7_batch(hands):
+    """Score an (n, 7) array of card ints in one vectorized pass."""
+    # Best unsuited score per row, straight from the 7-card rank table.
+    products = (hands & 0xFF).prod(axis=1)
+    scores = RANK7_VALS[np.searchsorted(RANK7_KEYS, products)].astype(np.int32)
+
+    # Overlay flush rows: a flush always beats whatever the unsuited pass
+    # found, since 5 suited cards leave at most trips among the other two.
+    rank_bits = hands >> 16
+    for s in range(4):
+        in_suit = (hands & (0x1000 << s)) != 0
+        rows = in_suit.sum(axis=1) >= 5
+        if not rows.any():
+            continue
+        masks = np.bitwise_or.reduce(
+            np.where(in_suit[rows], rank_bits[rows], 0), axis=1)
+        straights = STRAIGHT_LUT[masks]
+        flush_scores = FLUSH_LUT[np.where(straights, straights, TOP5_LUT[masks])]
+        scores[rows] = flush_scores
+    return scores
+
+
+def _simulate_showdowns_vec(p1, p2, p3, board, deck, n_sims):
+    """Vectorized counterpart of _simulate_showdowns for the no-numba case."""
+    need = 5 - board.shape[0]
+    if need > 0:
+        # Sample boards without replacement: indices of the `need` smallest
+        # uniforms per row pick a uniform k-subset of the deck.
+        uniforms = _NP_RNG.random((n_sims, deck.shape[0]))
+        picks = deck[np.argpartition(uniforms, need, axis=1)[:, :need]]
+    else:
+        picks = np.empty((n_sims, 0), dtype=np.int64)
+    boards = np.hstack([np.tile(board, (n_sims, 1)), picks])
+
+    scores = np.stack([
+        _evaluate7_batch(np.hstack([np.tile(hole, (n_sims, 1)), boards]))
+        for hole in (p1, p2, p3)
+    ])
+    best = scores.min(axis=0)
+    is_best = scores == best
+    tied = is_best.sum(axis=0) > 1
+
+    totals = np.zeros(4, dtype=np.int64)
+    totals[3] = tied.sum()
+    for p in range(3):
+        totals[p] = (is_best[p] & ~tied).sum()
+    return totals
 
 
 # ============================================================================
@@ -127,69 +382,48 @@ class PokerAI:
 
     @staticmethod
     def calculate_hand_strength(player_cards, board_cards, num_sims=500):
-        """Calculate hand strength as percentage (0-100)"""
-        all_cards = []
-        for rank in PokerHand.ALL_RANKS:
-            for suit in PokerHand.ALL_SUITS:
-                all_cards.append(rank + suit)
+        """Calculate hand strength as percentage (0-100) from card ints"""
+        return PokerAI._cached_hand_strength(tuple(sorted(player_cards)),
+                                             tuple(sorted(board_cards)),
+                                             num_sims)
 
-        known = set(player_cards + board_cards)
-        remaining = [c for c in all_cards if c not in known]
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _cached_hand_strength(player_cards, board_cards, num_sims):
+        """Monte Carlo body of calculate_hand_strength, memoized on the
+        sorted card tuples so Streamlit reruns reuse earlier estimates."""
+        known = set(player_cards) | set(board_cards)
+        remaining = [c for c in FULL_DECK if c not in known]
 
         if len(remaining) < 2:
             return 100.0
 
-        wins = 0
-        total = 0
-
-        for _ in range(min(num_sims, max(50, len(remaining) // 2))):
-            opp_cards = random.sample(remaining, min(2, len(remaining)))
-            if len(opp_cards) < 2:
-                continue
-
-            sim_remaining = [c for c in remaining if c not in opp_cards]
-            cards_needed = 5 - len(board_cards)
-
-            if cards_needed > 0 and len(sim_remaining) >= cards_needed:
-                sim_board = board_cards + random.sample(sim_remaining, cards_needed)
-            else:
-                sim_board = board_cards
-
-            try:
-                _, player_hand = PokerHand.best_five_from_seven(player_cards + sim_board)
-                _, opp_hand = PokerHand.best_five_from_seven(opp_cards + sim_board)
-
-                if player_hand >= opp_hand:
-                    wins += 1
-            except:
-                pass
-
-            total += 1
+        total = min(num_sims, max(50, len(remaining) // 2))
+        wins = _simulate_strength(_int_array(player_cards),
+                                  _int_array(board_cards),
+                                  _int_array(remaining),
+                                  total)
 
         return (wins / total * 100) if total > 0 else 50.0
 
     @staticmethod
     def get_board_texture(board_cards):
-        """Analyze board texture"""
+        """Analyze board texture from card ints"""
         if len(board_cards) < 3:
             return "unknown"
 
-        ranks = [PokerHand.RANKS[c[0]] for c in board_cards[:3]]
-        suits = [c[1] for c in board_cards[:3]]
+        rank_mask = 0
+        suit_mask = 0
+        for c in board_cards[:3]:
+            rank_mask |= c >> 16
+            suit_mask |= (c >> 12) & 0xF
 
-        suit_counts = Counter(suits)
-        is_suited = any(count >= 2 for count in suit_counts.values())
-
-        sorted_ranks = sorted(ranks, reverse=True)
-        is_connected = (sorted_ranks[0] - sorted_ranks[1] <= 2) and \
-                       (sorted_ranks[1] - sorted_ranks[2] <= 2)
-
-        if is_suited and is_connected:
-            return "wet"
-        elif is_suited or is_connected:
-            return "coordinated"
-        else:
-            return "dry"
+        # Suited: fewer than 3 distinct suit bits. Connected: no gap wider
+        # than 2 between adjacent board ranks, read off a precomputed table
+        # (duplicate ranks collapse into the mask without affecting it).
+        is_suited = suit_mask.bit_count() < 3
+        is_connected = CONNECTED_MASK[rank_mask]
+        return ("dry", "coordinated", "wet")[is_suited + is_connected]
 
     @staticmethod
     def recommend_action(player_cards, board_cards):
@@ -262,79 +496,69 @@ def calculate_win_probabilities(player1_cards, player2_cards, player3_cards,
 
     known_cards = set(player1_cards + player2_cards + player3_cards + current_board)
 
-    all_cards = []
-    for rank in PokerHand.ALL_RANKS:
-        for suit in PokerHand.ALL_SUITS:
-            all_cards.append(rank + suit)
+    remaining_cards = [c for c in FULL_DECK if c not in known_cards]
 
-    remaining_cards = [c for c in all_cards if c not in known_cards]
+    simulate = _simulate_showdowns if NUMBA_AVAILABLE else _simulate_showdowns_vec
+    totals = simulate(_int_array(player1_cards),
+                      _int_array(player2_cards),
+                      _int_array(player3_cards),
+                      _int_array(current_board),
+                      _int_array(remaining_cards),
+                      num_simulations)
 
-    player1_wins = 0
-    player2_wins = 0
-    player3_wins = 0
-    ties = 0
+    total = num_simulations
+    return {
+        'player1_win': (totals[0] / total) * 100,
+        'player2_win': (totals[1] / total) * 100,
+        'player3_win': (totals[2] / total) * 100,
+        'ties': (totals[3] / total) * 100
+    }
 
-    for _ in range(num_simulations):
-        cards_needed = 5 - len(current_board)
-        if cards_needed > 0 and len(remaining_cards) >= cards_needed:
-            additional_cards = random.sample(remaining_cards, cards_needed)
-        else:
-            additional_cards = []
-        complete_board = current_board + additional_cards
 
-        p1_hand, p1_score = PokerHand.best_five_from_seven(player1_cards + complete_board)
-        p2_hand, p2_score = PokerHand.best_five_from_seven(player2_cards + complete_board)
-        p3_hand, p3_score = PokerHand.best_five_from_seven(player3_cards + complete_board)
+def generate_random_cards(excluded_cards, count=2):
+    """Generate `count` random card ints not in the excluded set"""
+    available = [c for c in FULL_DECK if c not in excluded_cards]
+    dealt = _NP_RNG.choice(len(available), size=count, replace=False)
+    return [available[i] for i in dealt]
 
-        scores = [(p1_score, 1), (p2_score, 2), (p3_score, 3)]
-        scores.sort(reverse=True)
 
-        best_score = scores[0][0]
-        winners = [s[1] for s in scores if s[0] == best_score]
+@st.cache_data(show_spinner=False)
+def cached_win_probabilities(player1_cards, player2_cards, player3_cards,
+                             current_board, num_simulations=3000):
+    """st.cache_data front for calculate_win_probabilities.
 
-        if len(winners) > 1:
-            ties += 1
-        elif winners[0] == 1:
-            player1_wins += 1
-        elif winners[0] == 2:
-            player2_wins += 1
-        else:
-            player3_wins += 1
-
-    total = num_simulations
-    return {
-        'player1_win': (player1_wins / total) * 100,
-        'player2_win': (player2_wins / total) * 100,
-        'player3_win': (player3_wins / total) * 100,
-        'ties': (ties / total) * 100
-    }
+    Streamlit reruns the whole script on every widget change, which used to
+    re-simulate every completed street; with this cache only the street
+    whose cards just changed pays for its simulations."""
+    return calculate_win_probabilities(player1_cards, player2_cards,
+                                       player3_cards, current_board,
+                                       num_simulations)
 
 
-def generate_random_cards(excluded_cards):
-    """Generate 2 random cards not in excluded set"""
-    all_cards = []
-    for rank in PokerHand.ALL_RANKS:
-        for suit in PokerHand.ALL_SUITS:
-            all_cards.append(rank + suit)
-
-    available = [c for c in all_cards if c not in excluded_cards]
-    return random.sample(available, 2)
+def format_cards(cards):
+    """Render a list of card ints back to the display strings"""
+    return ' '.join(CARD_INT_TO_STR[c] for c in cards)
 
 
 def display_stage_analysis(stage_name, p1_cards, p2_cards, p3_cards, board_cards):
-    """Display analysis for a specific stage"""
+    """Display analysis for a specific stage; all cards are card ints"""
 
     # Calculate probabilities
-    probs = calculate_win_probabilities(p1_cards, p2_cards, p3_cards, board_cards, num_simulations=3000)
-
-    # Get AI recommendations
-    action1, conf1, reason1, strength1 = PokerAI.recommend_action(p1_cards, board_cards)
-    action2, conf2, reason2, strength2 = PokerAI.recommend_action(p2_cards, board_cards)
-    action3, conf3, reason3, strength3 = PokerAI.recommend_action(p3_cards, board_cards)
+    probs = cached_win_probabilities(p1_cards, p2_cards, p3_cards, board_cards, num_simulations=3000)
+
+    # Get AI recommendations for the three players in parallel; the
+    # strength kernel is compiled with nogil=True, so the simulations
+    # overlap instead of serializing on the GIL.
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(PokerAI.recommend_action, cards, board_cards)
+                   for cards in (p1_cards, p2_cards, p3_cards)]
+        ((action1, conf1, reason1, strength1),
+         (action2, conf2, reason2, strength2),
+         (action3, conf3, reason3, strength3)) = [f.result() for f in futures]
 
     # Display stage header
     st.markdown(f"### 📍 **{stage_name}**")
-    st.write(f"Board: **{' '.join(board_cards) if board_cards else 'Empty (Pre-Flop)'}**")
+    st.write(f"Board: **{format_cards(board_cards) if board_cards else 'Empty (Pre-Flop)'}**")
 
     # Win probabilities
     col1, col2, col3, col4 = st.columns(4)
@@ -427,18 +651,14 @@ if your_cards_input:
             st.error("❌ Please enter exactly 2 cards")
             st.stop()
 
-        for card in cards:
-            PokerHand.parse_card(card)
+        st.session_state.p1_cards = [card_to_int(c) for c in cards]
+        st.success(f"✅ Your cards: {format_cards(st.session_state.p1_cards)}")
 
-        st.session_state.p1_cards = [c.upper() for c in cards]
-        st.success(f"✅ Your cards: {' '.join(st.session_state.p1_cards)}")
-
-        # Generate opponent cards only once
+        # Generate opponent cards only once, both hands in a single draw
         if not st.session_state.game_started:
-            known_cards = set(st.session_state.p1_cards)
-            st.session_state.p2_cards = generate_random_cards(known_cards)
-            known_cards.update(st.session_state.p2_cards)
-            st.session_state.p3_cards = generate_random_cards(known_cards)
+            ai_cards = generate_random_cards(set(st.session_state.p1_cards), count=4)
+            st.session_state.p2_cards = ai_cards[:2]
+            st.session_state.p3_cards = ai_cards[2:]
             st.session_state.game_started = True
     except ValueError as e:
         st.error(f"❌ {str(e)}")
@@ -448,6 +668,17 @@ if not st.session_state.p1_cards:
     st.info("👆 Enter your cards to continue")
     st.stop()
 
+# Running set of every card known so far; each street below adds its own
+# cards to it instead of rebuilding the whole union from scratch.
+known_cards = set(st.session_state.p1_cards + st.session_state.p2_cards +
+                  st.session_state.p3_cards)
+
+# Per-player partial-hand states, extended street by street; after the
+# river each is a complete 7-card state the showdown scores directly.
+player_states = [partial_hand_state(st.session_state.p1_cards),
+                 partial_hand_state(st.session_state.p2_cards),
+                 partial_hand_state(st.session_state.p3_cards)]
+
 # ============================================================================
 # STEP 2: PRE-FLOP ANALYSIS
 # ============================================================================
@@ -483,46 +714,45 @@ if flop_input:
             st.error("❌ Please enter exactly 3 cards for the flop")
             st.stop()
 
-        for card in cards:
-            PokerHand.parse_card(card)
-
-        cards = [c.upper() for c in cards]
+        card_ints = [card_to_int(c) for c in cards]
 
         # Check duplicates with current AI cards
-        all_cards = set(st.session_state.p1_cards + st.session_state.p2_cards +
-                        st.session_state.p3_cards + cards)
-
-        if len(all_cards) != 9:
+        if len(set(card_ints)) != 3 or known_cards.intersection(card_ints):
             # DUPLICATE DETECTED - Regenerate AI cards
             st.warning("⚠️ Duplicate detected with initial AI cards. Regenerating AI opponent cards...")
 
             # Regenerate AI cards to avoid duplicates
-            excluded = set(st.session_state.p1_cards + cards)
-            st.session_state.p2_cards = generate_random_cards(excluded)
-            excluded.update(st.session_state.p2_cards)
-            st.session_state.p3_cards = generate_random_cards(excluded)
+            excluded = set(st.session_state.p1_cards + card_ints)
+            ai_cards = generate_random_cards(excluded, count=4)
+            st.session_state.p2_cards = ai_cards[:2]
+            st.session_state.p3_cards = ai_cards[2:]
+            known_cards = set(st.session_state.p1_cards) | set(ai_cards)
+            player_states[1] = partial_hand_state(ai_cards[:2])
+            player_states[2] = partial_hand_state(ai_cards[2:])
 
             # Verify again
-            all_cards = set(st.session_state.p1_cards + st.session_state.p2_cards +
-                            st.session_state.p3_cards + cards)
-
-            if len(all_cards) == 9:
-                st.session_state.flop_cards = cards
+            if len(set(card_ints)) == 3 and not known_cards.intersection(card_ints):
+                known_cards.update(card_ints)
+                st.session_state.flop_cards = card_ints
                 flop_valid = True
-                st.success(f"✅ Flop: {' '.join(cards)} (AI cards regenerated)")
+                st.success(f"✅ Flop: {format_cards(card_ints)} (AI cards regenerated)")
             else:
                 st.error("❌ Failed to resolve duplicates. Please try again.")
                 st.stop()
         else:
-            st.session_state.flop_cards = cards
+            known_cards.update(card_ints)
+            st.session_state.flop_cards = card_ints
             flop_valid = True
-            st.success(f"✅ Flop: {' '.join(cards)}")
+            st.success(f"✅ Flop: {format_cards(card_ints)}")
 
     except ValueError as e:
         st.error(f"❌ {str(e)}")
         st.stop()
 
 if flop_valid:
+    player_states = [extend_partial_state(s, st.session_state.flop_cards)
+                     for s in player_states]
+
     with st.expander("📊 Flop Analysis", expanded=True):
         display_stage_analysis("Flop",
                                st.session_state.p1_cards,
@@ -548,35 +778,37 @@ if flop_valid:
     if turn_input:
         try:
             card = turn_input.strip().upper()
-            PokerHand.parse_card(card)
+            card_int = card_to_int(card)
 
             # Check duplicates
-            all_cards = set(st.session_state.p1_cards + st.session_state.p2_cards +
-                            st.session_state.p3_cards + st.session_state.flop_cards + [card])
-
-            if len(all_cards) != 10:
+            if card_int in known_cards:
                 # DUPLICATE DETECTED - Regenerate AI cards
                 st.warning("⚠️ Duplicate detected. Regenerating AI opponent cards...")
 
                 # Regenerate AI cards to avoid duplicates
-                excluded = set(st.session_state.p1_cards + st.session_state.flop_cards + [card])
-                st.session_state.p2_cards = generate_random_cards(excluded)
-                excluded.update(st.session_state.p2_cards)
-                st.session_state.p3_cards = generate_random_cards(excluded)
+                excluded = set(st.session_state.p1_cards + st.session_state.flop_cards + [card_int])
+                ai_cards = generate_random_cards(excluded, count=4)
+                st.session_state.p2_cards = ai_cards[:2]
+                st.session_state.p3_cards = ai_cards[2:]
+                known_cards = (set(st.session_state.p1_cards) | set(ai_cards) |
+                               set(st.session_state.flop_cards))
+                player_states[1] = partial_hand_state(ai_cards[:2] +
+                                                      st.session_state.flop_cards)
+                player_states[2] = partial_hand_state(ai_cards[2:] +
+                                                      st.session_state.flop_cards)
 
                 # Verify again
-                all_cards = set(st.session_state.p1_cards + st.session_state.p2_cards +
-                                st.session_state.p3_cards + st.session_state.flop_cards + [card])
-
-                if len(all_cards) == 10:
-                    st.session_state.turn_card = card
+                if card_int not in known_cards:
+                    known_cards.add(card_int)
+                    st.session_state.turn_card = card_int
                     turn_valid = True
                     st.success(f"✅ Turn: {card} (AI cards regenerated)")
                 else:
                     st.error("❌ Failed to resolve duplicates. Please try again.")
                     st.stop()
             else:
-                st.session_state.turn_card = card
+                known_cards.add(card_int)
+                st.session_state.turn_card = card_int
                 turn_valid = True
                 st.success(f"✅ Turn: {card}")
 
@@ -586,6 +818,8 @@ if flop_valid:
 
     if turn_valid:
         turn_board = st.session_state.flop_cards + [st.session_state.turn_card]
+        player_states = [extend_partial_state(s, [st.session_state.turn_card])
+                         for s in player_states]
 
         with st.expander("📊 Turn Analysis", expanded=True):
             display_stage_analysis("Turn",
@@ -611,37 +845,37 @@ if flop_valid:
         if river_input:
             try:
                 card = river_input.strip().upper()
-                PokerHand.parse_card(card)
+                card_int = card_to_int(card)
 
                 # Check duplicates
-                all_cards = set(st.session_state.p1_cards + st.session_state.p2_cards +
-                                st.session_state.p3_cards + st.session_state.flop_cards +
-                                [st.session_state.turn_card] + [card])
-
-                if len(all_cards) != 11:
+                if card_int in known_cards:
                     # DUPLICATE DETECTED - Regenerate AI cards
                     st.warning("⚠️ Duplicate detected. Regenerating AI opponent cards...")
 
                     # Regenerate AI cards to avoid duplicates
                     excluded = set(st.session_state.p1_cards + st.session_state.flop_cards +
-                                   [st.session_state.turn_card] + [card])
-                    st.session_state.p2_cards = generate_random_cards(excluded)
-                    excluded.update(st.session_state.p2_cards)
-                    st.session_state.p3_cards = generate_random_cards(excluded)
+                                   [st.session_state.turn_card] + [card_int])
+                    ai_cards = generate_random_cards(excluded, count=4)
+                    st.session_state.p2_cards = ai_cards[:2]
+                    st.session_state.p3_cards = ai_cards[2:]
+                    known_cards = (set(st.session_state.p1_cards) | set(ai_cards) |
+                                   set(st.session_state.flop_cards) |
+                                   {st.session_state.turn_card})
+                    player_states[1] = partial_hand_state(ai_cards[:2] + turn_board)
+                    player_states[2] = partial_hand_state(ai_cards[2:] + turn_board)
 
                     # Verify again
-                    all_cards = set(st.session_state.p1_cards + st.session_state.p2_cards +
-                                    st.session_state.p3_cards + st.session_state.flop_cards +
-                                    [st.session_state.turn_card] + [card])
-
-                    if len(all_cards) != 11:
+                    if card_int in known_cards:
                         st.error("❌ Failed to resolve duplicates. Please try again.")
                         st.stop()
 
-                st.session_state.river_card = card
+                known_cards.add(card_int)
+                st.session_state.river_card = card_int
                 st.success(f"✅ River: {card}")
 
-                final_board = turn_board + [card]
+                final_board = turn_board + [card_int]
+                player_states = [extend_partial_state(s, [card_int])
+                                 for s in player_states]
 
                 with st.expander("📊 River Analysis", expanded=True):
                     display_stage_analysis("River",
@@ -659,12 +893,16 @@ if flop_valid:
                 final_board_list = st.session_state.flop_cards + [st.session_state.turn_card,
                                                                   st.session_state.river_card]
 
-                # Get best hands
-                hand1, score1 = PokerHand.best_five_from_seven(st.session_state.p1_cards + final_board_list)
-                hand2, score2 = PokerHand.best_five_from_seven(st.session_state.p2_cards + final_board_list)
-                hand3, score3 = PokerHand.best_five_from_seven(st.session_state.p3_cards + final_board_list)
+                # Score each player straight from the 7-card partial state
+                # built up over the streets, then recover the display cards.
+                score1 = evaluate_partial(player_states[0])
+                score2 = evaluate_partial(player_states[1])
+                score3 = evaluate_partial(player_states[2])
+                hand1 = PokerHand.hand_for_score(st.session_state.p1_cards + final_board_list, score1)
+                hand2 = PokerHand.hand_for_score(st.session_state.p2_cards + final_board_list, score2)
+                hand3 = PokerHand.hand_for_score(st.session_state.p3_cards + final_board_list, score3)
 
-                st.markdown(f"**Board:** {' '.join(final_board_list)}")
+                st.markdown(f"**Board:** {format_cards(final_board_list)}")
                 st.markdown("---")
 
                 col1, col2, col3 = st.columns(3)
@@ -673,25 +911,25 @@ if flop_valid:
                     with st.container(border=True):
                         st.markdown("### 👤 **YOU**")
                         st.markdown(f"**{PokerHand.hand_rank_name(score1)}**")
-                        st.code(' '.join(hand1), language="text")
+                        st.code(format_cards(hand1), language="text")
 
                 with col2:
                     with st.container(border=True):
                         st.markdown("### 🤖 **AI 1**")
                         st.markdown(f"**{PokerHand.hand_rank_name(score2)}**")
-                        st.code(f"{' '.join(st.session_state.p2_cards)} → {' '.join(hand2)}", language="text")
+                        st.code(f"{format_cards(st.session_state.p2_cards)} → {format_cards(hand2)}", language="text")
 
                 with col3:
                     with st.container(border=True):
                         st.markdown("### 🤖 **AI 2**")
                         st.markdown(f"**{PokerHand.hand_rank_name(score3)}**")
-                        st.code(f"{' '.join(st.session_state.p3_cards)} → {' '.join(hand3)}", language="text")
+                        st.code(f"{format_cards(st.session_state.p3_cards)} → {format_cards(hand3)}", language="text")
 
                 st.markdown("---")
 
                 # Determine winner
                 scores = [(score1, "You"), (score2, "AI 1"), (score3, "AI 2")]
-                scores.sort(reverse=True)
+                scores.sort(key=lambda s: s[0])
 
                 if scores[0][0] == scores[1][0]:
                     st.warning(f"🤝 **TIE!** Multiple players have {PokerHand.hand_rank_name(scores[0][0])}")
@@ -0,0 +1,206 @@
+"""Cactus-Kev lookup tables for the poker evaluator.
+
+Each card is a 32-bit int: bits 16-28 are a one-hot rank, bits 12-15 a
+one-hot suit, bits 8-11 the rank index and bits 0-7 a prime for the rank.
+ORing five cards exposes a flush in the suit nibble; multiplying the five
+primes uniquely identifies the rank multiset, so a 5-card hand is scored
+with a single dict lookup instead of Counter/sort work.
+
+The tables live in their own module because Streamlit re-executes the main
+script on every widget interaction: built at module level of poker_app.py
+they would be rebuilt (~0.5s, dominated by the 7-card table) on every
+rerun, while an imported module is cached in sys.modules and pays the
+build exactly once per process.
+"""
+
+import itertools
+
+import numpy as np
+
+# Ranks low to high and suits, in the same order as PokerHand's dicts.
+RANK_ORDER = '23456789TJQKA'
+SUIT_ORDER = 'HDCS'
+
+PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+# The ten straight rank-masks, best (ace-high) first; the wheel is last.
+STRAIGHT_MASKS = tuple(0b11111 << i for i in range(8, -1, -1)) + (0b1000000001111,)
+
+
+def _build_straight_table():
+    """straight[mask] is the best straight's rank mask within mask, else 0."""
+    table = [0] * 8192
+    for mask in range(8192):
+        for straight_mask in STRAIGHT_MASKS:
+            if mask & straight_mask == straight_mask:
+                table[mask] = straight_mask
+                break
+    return table
+
+
+STRAIGHT_OF_MASK = _build_straight_table()
+
+
+def _build_lookup_tables():
+    """Rank all 7462 distinct 5-card hand classes from 1 (best) to 7462."""
+
+    # Paired hands are fully determined by their count pattern, so each
+    # pattern maps straight to its tuple constructor instead of re-walking
+    # an if/elif chain per hand class.
+    pattern_scores = {
+        (4, 1): lambda by: (7, by(4)[0]),
+        (3, 2): lambda by: (6, by(3)[0], by(2)[0]),
+        (3, 1, 1): lambda by: (3, by(3)[0], tuple(by(1))),
+        (2, 2, 1): lambda by: (2, tuple(by(2)), by(1)[0]),
+        (2, 1, 1, 1): lambda by: (1, by(2)[0], tuple(by(1))),
+    }
+
+    def class_score(rank_vals, is_flush):
+        # Comparison tuple in the same order the old evaluator produced,
+        # using a fixed 15-slot count array (index = rank value).
+        count = [0] * 15
+        for r in rank_vals:
+            count[r] += 1
+        counts = tuple(sorted((c for c in count if c), reverse=True))
+
+        if counts[0] > 1:
+            return pattern_scores[counts](
+                lambda n: [r for r in range(14, 1, -1) if count[r] == n])
+
+        # Five distinct ranks: straight, flush or high card.
+        mask = 0
+        for r in rank_vals:
+            mask |= 1 << (r - 2)
+        straight_mask = STRAIGHT_OF_MASK[mask]
+        if straight_mask:
+            straight_high = (5 if straight_mask == STRAIGHT_MASKS[-1]
+                             else straight_mask.bit_length() + 1)
+            return (8, straight_high) if is_flush else (4, straight_high)
+
+        sorted_ranks = tuple(sorted(rank_vals, reverse=True))
+        return (5, sorted_ranks) if is_flush else (0, sorted_ranks)
+
+    entries = []
+    for idxs in itertools.combinations_with_replacement(range(13), 5):
+        rank_vals = tuple(i + 2 for i in idxs)
+        if max(rank_vals.count(r) for r in rank_vals) > 4:
+            continue  # five of a kind is impossible
+
+        product = 1
+        for i in idxs:
+            product *= PRIMES[i]
+        entries.append((class_score(rank_vals, False), False, product))
+
+        if len(set(idxs)) == 5:
+            mask = 0
+            for i in idxs:
+                mask |= 1 << i
+            entries.append((class_score(rank_vals, True), True, mask))
+
+    entries.sort(reverse=True)
+
+    flush_lookup = {}
+    unsuited_lookup = {}
+    category = [0] * (len(entries) + 1)
+    for value, (score, is_flush, key) in enumerate(entries, 1):
+        if is_flush:
+            flush_lookup[key] = value
+        else:
+            unsuited_lookup[key] = value
+        category[value] = score[0]
+    category[1] = 9  # the ace-high straight flush is the royal
+
+    return flush_lookup, unsuited_lookup, category
+
+
+FLUSH_LOOKUP, UNSUITED_LOOKUP, HAND_CATEGORY = _build_lookup_tables()
+
+
+def _build_top5_table():
+    """top5[mask] keeps only the 5 highest set bits of a 13-bit rank mask."""
+    table = [0] * 8192
+    for mask in range(8192):
+        kept = 0
+        count = 0
+        bit = 1 << 12
+        while bit and count < 5:
+            if mask & bit:
+                kept |= bit
+                count += 1
+            bit >>= 1
+        table[mask] = kept
+    return table
+
+
+TOP5_OF_MASK = _build_top5_table()
+
+
+def _build_connected_table():
+    """connected[mask]: every gap between adjacent ranks in mask is <= 2."""
+    table = [False] * 8192
+    for mask in range(1, 8192):
+        bits = [i for i in range(13) if mask >> i & 1]
+        table[mask] = all(b - a <= 2 for a, b in zip(bits, bits[1:]))
+    return table
+
+
+CONNECTED_MASK = _build_connected_table()
+
+
+def _build_rank7_lookup():
+    """Best unsuited score for every 7-card rank multiset, keyed by the
+    product of the seven rank primes (PH-Evaluator style).
+
+    Built bottom-up: the best score of a 6-card multiset is the minimum of
+    its 5-card sub-multisets, and likewise for 7 from 6, so the whole table
+    costs one dict lookup per card removed instead of 21 per hand."""
+    best6 = {}
+    for idxs in itertools.combinations_with_replacement(range(13), 6):
+        if any(idxs.count(i) > 4 for i in set(idxs)):
+            continue
+        product = 1
+        for i in idxs:
+            product *= PRIMES[i]
+        best6[product] = min(UNSUITED_LOOKUP[product // PRIMES[i]]
+                             for i in set(idxs))
+
+    best7 = {}
+    for idxs in itertools.combinations_with_replacement(range(13), 7):
+        if any(idxs.count(i) > 4 for i in set(idxs)):
+            continue
+        product = 1
+        for i in idxs:
+            product *= PRIMES[i]
+        best7[product] = min(best6[product // PRIMES[i]] for i in set(idxs))
+    return best7
+
+
+RANK7_LOOKUP = _build_rank7_lookup()
+
+# Flat numpy copies of the tables for the numba kernels. The unsuited table
+# is a sorted key array searched with np.searchsorted instead of a dict.
+FLUSH_LUT = np.zeros(8192, dtype=np.int16)
+for _mask, _value in FLUSH_LOOKUP.items():
+    FLUSH_LUT[_mask] = _value
+TOP5_LUT = np.array(TOP5_OF_MASK, dtype=np.int16)
+STRAIGHT_LUT = np.array(STRAIGHT_OF_MASK, dtype=np.int16)
+RANK7_KEYS = np.array(sorted(RANK7_LOOKUP), dtype=np.int64)
+RANK7_VALS = np.array([RANK7_LOOKUP[int(k)] for k in RANK7_KEYS],
+                      dtype=np.int16)
+
+CARD_INT = {
+    rank + suit: (1 << (16 + i)) | (1 << (12 + j)) | (i << 8) | PRIMES[i]
+    for i, rank in enumerate(RANK_ORDER)
+    for j, suit in enumerate(SUIT_ORDER)
+}
+CARD_INT_TO_STR = {card_int: card for card, card_int in CARD_INT.items()}
+
+# The full 52-card deck as ints, built once instead of per call.
+FULL_DECK = tuple(CARD_INT.values())
+
+# Every valid card string pre-split into (rank, suit), so parse_card is a
+# single dict probe on the happy path.
+PARSE_CARD = {card: (card[:-1], card[-1]) for card in CARD_INT}
+
+# One-hot suit nibble (card & 0xF000) back to a 0-3 suit index.
+SUIT_INDEX = {0x1000: 0, 0x2000: 1, 0x4000: 2, 0x8000: 3}